@@ -1,5 +1,377 @@
+import csv
+import functools
+import os
+
 import numpy as np
-import pandas as pd
+from numba import njit, prange
+from numba.extending import register_jitable
+
+# Cards are stored as a single uint8, bits 0-3 are the rank code (0 is an ace, 1-8 are 2-9 and 9-12 are 10/J/Q/K)
+# and bits 4-5 are the suit
+RANK_MASK = 0x0F
+SUIT_SHIFT = 4
+ACE = 0
+TEN = 9
+# Labels matching the row/column names of basic_strats.csv (face cards count as 10)
+RANK_LABELS = ['A'] + [str(val) for val in range(2, 11)] + ['10', '10', '10']
+# Point value of each rank code (aces count as 1 here)
+_VALUE = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10)
+# Size of the hand buffers, a hand can't hold more cards than this without going over 21
+MAX_HAND = 21
+# Maximum number of hands a player can split into
+MAX_SPLITS = 4
+
+# Move codes stored in the strategy tables, MOVES translates them back to the moves used by Player/Dealer
+HIT, STAND, DOUBLE, SPLIT = 0, 1, 2, 3
+MOVES = ('hit', 'stand', 'double', 'split')
+
+# Change in the bet (in units of the minimum bet) after each outcome ('win', 'loss' or 'push') for D'Alembert
+_DALEMBERT_DELTA = {'win': -1, 'loss': 1, 'push': 0, None: 0}
+
+# Rows of the strategy tables: hard totals 5-21, soft hands A2-A9, blackjack ("A10", always stand), then pairs
+# by rank code (10/J/Q/K share the "10,10" row)
+_TOTAL_ROW = 0
+_SOFT_ROW = 17
+_BLACKJACK_ROW = 25
+_PAIR_ROW = 26
+_STATE_LABELS = [str(total) for total in range(5, 22)] + [f"A{RANK_LABELS[rank]}" for rank in range(1, TEN + 1)] + [f"{label},{label}" for label in RANK_LABELS]
+
+# Helpers marked register_jitable stay plain python functions but can also be called from numba functions
+
+@register_jitable
+def _best_total(hard_total, num_aces):
+    """
+    Returns the value of a hand from its hard total (aces counted as 1), counting one ace as 11 if it doesn't bust the hand.
+    """
+    if num_aces and hard_total + 10 <= 21:
+        return hard_total + 10
+    return hard_total
+
+# Compiled version of _best_total for the numba functions
+_best_total_jit = njit(cache=True)(_best_total)
+
+@njit(cache=True)
+def _add_card(hand, num_cards, hard_total, num_aces, card):
+    """
+    Adds a card to a hand buffer and updates its running totals.
+
+    Return
+    ------
+    tuple, the new number of cards, hard total and number of aces of the hand.
+    """
+    hand[num_cards] = card
+    rank = card & RANK_MASK
+    return num_cards + 1, hard_total + _VALUE[rank], num_aces + (rank == ACE)
+
+def check_blackjack(first, second):
+    """
+    Checks whether a two card hand has blackjack.
+
+    Parameters
+    ----------
+    first : int
+        Rank code of the first card.
+    second : int
+        Rank code of the second card.
+
+    Return
+    ------
+    bool, whether or not the hand is blackjack.
+    """
+    return ((first == ACE) & (second >= TEN)) | ((second == ACE) & (first >= TEN))
+
+# Compiled version of check_blackjack for the numba functions
+_check_blackjack_jit = njit(cache=True)(check_blackjack)
+
+@register_jitable
+def _total_row(total):
+    """
+    Returns the strategy table row for a hand total (hands below 5 play like 5).
+    """
+    return _TOTAL_ROW + min(max(total, 5), 21) - 5
+
+# Compiled version of _total_row for the numba functions
+_total_row_jit = njit(cache=True)(_total_row)
+
+def _hand_state(hand, num_cards, hard_total, num_aces):
+    """
+    Encodes a hand as its row in the strategy tables, the player's move is strat[hand_state(hand), dealer up rank].
+    Player calls this directly, play_round uses the compiled hand_state (calling numba functions from python
+    costs more than the lookup itself).
+
+    Parameters
+    ----------
+    hand : np.ndarray
+        Buffer with the cards in the player's hand.
+    num_cards : int
+        Number of cards in the player's hand.
+    hard_total : int
+        Running total of the hand with aces counted as 1.
+    num_aces : int
+        Number of aces in the hand.
+
+    Return
+    ------
+    int, the row of the strategy table to use for the hand.
+    """
+    if num_cards == 2:
+        first = int(hand[0]) & RANK_MASK
+        second = int(hand[1]) & RANK_MASK
+        if first == second:
+            return _PAIR_ROW + first
+        elif num_aces:
+            # The ace's rank code is 0 so the other card's rank is the sum
+            other = first + second
+            if other >= TEN:
+                return _BLACKJACK_ROW
+            return _SOFT_ROW + other - 1
+    return _total_row(_best_total(hard_total, num_aces))
+
+# Compiled version of _hand_state for the numba functions
+hand_state = njit(cache=True)(_hand_state)
+
+def _decide_dealer(hard_total, num_aces, hit_on_soft17):
+    """
+    Decides the dealer's next move.
+
+    Parameters
+    ----------
+    hard_total : int
+        Running total of the dealer's hand with aces counted as 1.
+    num_aces : int
+        Number of aces in the dealer's hand.
+    hit_on_soft17 : bool
+        Whether or not the dealer must hit on a soft 17 (an ace counted as 11).
+
+    Return
+    ------
+    int, the move code (HIT or STAND).
+    """
+    total = _best_total(hard_total, num_aces)
+    if total < 17 or (hit_on_soft17 and total == 17 and total != hard_total):
+        return HIT
+    else:
+        return STAND
+
+# Compiled version of _decide_dealer for the numba functions, Dealer calls _decide_dealer directly
+decide_dealer = njit(cache=True)(_decide_dealer)
+
+def _cut_card_bounds(cut_card_loc):
+    """
+    Returns the range [low, high) that the cut card location (number of cards left behind it) is drawn from.
+    """
+    cut_cards = 52*cut_card_loc
+    return int(.5*cut_cards), int(1.5*cut_cards)
+
+# Compiled version of _cut_card_bounds for the numba functions
+_cut_card_bounds_jit = njit(cache=True)(_cut_card_bounds)
+
+@njit(cache=True)
+def _draw(deck, top):
+    """
+    Deals the top card of the deck, reshuffling it first if every card has been dealt.
+
+    Return
+    ------
+    tuple, the card and the new index of the top card.
+    """
+    if top < 0:
+        np.random.shuffle(deck)
+        top = len(deck) - 1
+    return deck[top], top - 1
+
+@njit(cache=True)
+def play_round(deck, top, player_hands, dealer_hand, strat, hit_on_soft17=True, max_units=np.inf):
+    """
+    Plays a full round of a player (using a strategy table) against the dealer. Split hands are
+    played like any other hand, up to MAX_SPLITS hands.
+
+    Parameters
+    ----------
+    deck : np.ndarray
+        The shuffled deck of cards (treated like a stack so the "top card" is the last value in the array).
+    top : int
+        Index of the top card of the deck.
+    player_hands : np.ndarray
+        (MAX_SPLITS, MAX_HAND) buffer for the player's hands.
+    dealer_hand : np.ndarray
+        (MAX_HAND,) buffer for the dealer's hand.
+    strat : np.ndarray
+        The player's strategy table of move codes (Player.move_table after Player.choose_play_strategy).
+    hit_on_soft17 : bool
+        Whether or not the dealer must hit on a soft 17 (A + 6). Default True.
+    max_units : float
+        The most the player can have bet in total this round, in units of the initial bet (the bank divided by
+        the bet). Doubles and splits the player can't cover are played as a hit/the hand total instead. Default no limit.
+
+    Return
+    ------
+    tuple, the amount won (negative if lost) in units of the initial bet and the new index of the top card.
+    """
+    cards, hard, aces = 0, 0, 0
+    dealer_cards, dealer_hard, dealer_aces = 0, 0, 0
+    for _ in range(2):
+        card, top = _draw(deck, top)
+        cards, hard, aces = _add_card(player_hands[0], cards, hard, aces, card)
+        card, top = _draw(deck, top)
+        dealer_cards, dealer_hard, dealer_aces = _add_card(dealer_hand, dealer_cards, dealer_hard, dealer_aces, card)
+
+    # Blackjacks end the round right away
+    player_blackjack = _check_blackjack_jit(player_hands[0, 0] & RANK_MASK, player_hands[0, 1] & RANK_MASK)
+    dealer_blackjack = _check_blackjack_jit(dealer_hand[0] & RANK_MASK, dealer_hand[1] & RANK_MASK)
+    if player_blackjack and dealer_blackjack:
+        return 0.0, top
+    elif player_blackjack:
+        return 1.5, top
+    elif dealer_blackjack:
+        return -1.0, top
+
+    dealer_up = dealer_hand[0] & RANK_MASK
+    # Running totals of each (split) hand
+    num_cards = np.zeros(MAX_SPLITS, np.int64)
+    hard_totals = np.zeros(MAX_SPLITS, np.int64)
+    num_aces = np.zeros(MAX_SPLITS, np.int64)
+    totals = np.zeros(MAX_SPLITS, np.int64)
+    bets = np.ones(MAX_SPLITS)
+    num_cards[0], hard_totals[0], num_aces[0] = cards, hard, aces
+    num_hands = 1
+    # Total amount bet on all hands
+    exposure = 1.0
+
+    hand = 0
+    while hand < num_hands:
+        hand_cards = player_hands[hand]
+        cards, hard, aces = num_cards[hand], hard_totals[hand], num_aces[hand]
+        total = _best_total_jit(hard, aces)
+        while total < 21:
+            move = strat[hand_state(hand_cards, cards, hard, aces), dealer_up]
+            can_cover = exposure + bets[hand] <= max_units
+            if move == SPLIT and (num_hands == MAX_SPLITS or not can_cover):
+                move = strat[_total_row_jit(total), dealer_up]
+            if move == DOUBLE and (cards != 2 or not can_cover):
+                # Doubling is only allowed on the first two cards and if the player can cover it
+                move = HIT
+
+            if move == STAND:
+                break
+            elif move == SPLIT:
+                # Move the second card to a new hand, then deal both hands a second card
+                new_cards = player_hands[num_hands]
+                new_count, new_hard, new_aces = _add_card(new_cards, 0, 0, 0, hand_cards[1])
+                cards, hard, aces = _add_card(hand_cards, 0, 0, 0, hand_cards[0])
+                card, top = _draw(deck, top)
+                cards, hard, aces = _add_card(hand_cards, cards, hard, aces, card)
+                card, top = _draw(deck, top)
+                num_cards[num_hands], hard_totals[num_hands], num_aces[num_hands] = _add_card(new_cards, new_count, new_hard, new_aces, card)
+                bets[num_hands] = bets[hand]
+                exposure += bets[hand]
+                num_hands += 1
+            elif move == DOUBLE:
+                exposure += bets[hand]
+                bets[hand] *= 2
+                card, top = _draw(deck, top)
+                cards, hard, aces = _add_card(hand_cards, cards, hard, aces, card)
+                total = _best_total_jit(hard, aces)
+                break
+            else:
+                card, top = _draw(deck, top)
+                cards, hard, aces = _add_card(hand_cards, cards, hard, aces, card)
+            total = _best_total_jit(hard, aces)
+        totals[hand] = total
+        hand += 1
+
+    # The dealer only plays if the player has a hand that didn't bust
+    if totals[:num_hands].min() <= 21:
+        while decide_dealer(dealer_hard, dealer_aces, hit_on_soft17) == HIT:
+            card, top = _draw(deck, top)
+            dealer_cards, dealer_hard, dealer_aces = _add_card(dealer_hand, dealer_cards, dealer_hard, dealer_aces, card)
+    dealer_total = _best_total_jit(dealer_hard, dealer_aces)
+
+    result = 0.0
+    for hand in range(num_hands):
+        if totals[hand] > 21 or (dealer_total <= 21 and totals[hand] < dealer_total):
+            result -= bets[hand]
+        elif dealer_total > 21 or totals[hand] > dealer_total:
+            result += bets[hand]
+    return result, top
+
+@njit(cache=True, parallel=True)
+def simulate_many(n_runs, n_hands, seed, full_deck, strat, cut_card_loc=1, bank=1000., min_bet=15, max_bet=1000,
+                  hit_on_soft17=True):
+    """
+    Simulates many independent sessions of a player using the D'Alembert betting strategy, in parallel.
+
+    Parameters
+    ----------
+    n_runs : int
+        The number of sessions to simulate.
+    n_hands : int
+        The number of hands played in each session. A session ends early if the player can't afford the next bet.
+    seed : int
+        Seed for the random number generator, session i is seeded with seed + i.
+    full_deck : np.ndarray
+        The unshuffled deck to play with (see Deck.full_deck).
+    strat : np.ndarray
+        The player's strategy table of move codes (Player.move_table after Player.choose_play_strategy).
+    cut_card_loc : float
+        Approximate location of where the cut card is place (from the end of the shoe).
+    bank : float
+        Amount of money that the player starts with.
+    min_bet : int
+        The minimum bet allowed at the table.
+    max_bet : int
+        The maxiumum bet allowed at the table.
+    hit_on_soft17 : bool
+        Whether or not the dealer must hit on a soft 17 (A + 6).
+
+    Return
+    ------
+    np.ndarray, the player's bank at the end of each session.
+    """
+    banks = np.empty(n_runs)
+    for i in prange(n_runs):
+        np.random.seed(seed + i)
+        deck = full_deck.copy()
+        player_hands = np.empty((MAX_SPLITS, MAX_HAND), dtype=np.uint8)
+        dealer_hand = np.empty(MAX_HAND, dtype=np.uint8)
+        top = -1
+        cut_index = 0
+        session_bank = bank
+        bet = min_bet
+        for _ in range(n_hands):
+            if top < cut_index:
+                np.random.shuffle(deck)
+                top = len(deck) - 1
+                low, high = _cut_card_bounds_jit(cut_card_loc)
+                cut_index = np.random.randint(low, high)
+            if bet > session_bank:
+                break
+
+            # Only double/split when the rest of the bank covers it so the bank never goes negative
+            result, top = play_round(deck, top, player_hands, dealer_hand, strat, hit_on_soft17, session_bank/bet)
+            session_bank += result*bet
+
+            # D'Alembert: go up a unit after a loss and down a unit after a win
+            if result > 0:
+                bet = max(bet - min_bet, min_bet)
+            elif result < 0:
+                bet = min(bet + min_bet, max_bet)
+        banks[i] = session_bank
+    return banks
+
+@functools.lru_cache(maxsize=8)
+def _full_deck(num_decks):
+    """
+    Builds the unshuffled cards for a number of decks. The array is cached and shared between Deck objects so it is
+    made read-only.
+
+    Return
+    ------
+    np.ndarray, Deck.one_deck repeated num_decks times.
+    """
+    full_deck = np.tile(Deck.one_deck, num_decks)
+    full_deck.setflags(write=False)
+    return full_deck
 
 class Deck(object):
     """
@@ -14,19 +386,25 @@ class Deck(object):
         Approximate location of where the cut card is place (from the end of the shoe). Must be between .5 and 2 inclusive. Actual location will be randomly adjusted.
     """
 
-    # Creates a list of card suit/values pairs as strings that represents a single deck
+    __slots__ = ('num_decks', 'cut_card_loc', 'full_deck', 'current_deck', 'cut_index', '_rng', '_top')
+
+    # Creates an array of cards (suit/rank pairs packed into a uint8) that represents a single deck
     
-    one_deck = [f"{val}{suit}" for suit in ['D', 'H', 'C', 'S'] for val in list(range(2,11)) + ['J', 'Q', 'K', 'A']]
+    one_deck = ((np.arange(4, dtype=np.uint8)[:, None] << SUIT_SHIFT) | np.arange(13, dtype=np.uint8)).ravel()
     
     def __init__(self, num_decks=6, cut_card_loc=1):
-        if not (isinstance(num_decks, int) and (isinstance(cut_card_loc, int) or isinstance(cut_card_loc, float))):
+        # numpy scalars are accepted too
+        if not (isinstance(num_decks, (int, np.integer)) and isinstance(cut_card_loc, (int, float, np.integer, np.floating))):
             raise TypeError("Please enter an integer for num_decks or an interger or float for cut_card_loc!")
-        if (not 0 < num_decks < 9) or (not .5 <= cut_card_loc <= 2):
+        if not (1 <= num_decks <= 8 and .5 <= cut_card_loc <= 2):
             raise ValueError('Please enter a number of decks between 1 and 8 or the cut card location between .5 and 2!')
         self.num_decks = num_decks
         self.cut_card_loc = cut_card_loc
-        self.full_deck = one_deck*self.num_decks
-        self.current_deck = None
+        self.full_deck = _full_deck(self.num_decks)
+        self.current_deck = self.full_deck.copy()
+        self.cut_index = None
+        self._rng = np.random.default_rng()
+        self._top = None
         
         self.shuffle()
         
@@ -34,13 +412,84 @@ class Deck(object):
         """
         Mutates the current_deck atrribute of the Deck object to shuffle the cards.
         """
-        self.current_deck = list(np.random.choice(self.full_deck, size=len(self.full_deck)))
+        self._rng.shuffle(self.current_deck)
+        # The deck is treated like a stack so the "top card" is the last value in the array
+        self._top = len(self.current_deck) - 1
         
-        # Add the cut card to the shuffled deck
-        location = int(np.random.uniform(.5, 1.5)*(52*self.cut_card_loc))
-        self.current_deck.insert(location, '0')
+        # Keep track of where the cut card is (number of cards left behind it) instead of inserting it into the deck
+        low, high = _cut_card_bounds(self.cut_card_loc)
+        self.cut_index = int(self._rng.integers(low, high))
 
-class Dealer(object):
+    def check_cut_card(self):
+        """
+        Checks whether the cut card has been reached. Only needs to be checked between rounds, the deck should be
+        shuffled before the next round if it has.
+
+        Return
+        ------
+        bool, whether or not the cut card has been reached.
+        """
+        return self._top < self.cut_index
+
+class _Hand(object):
+    """
+    Keeps track of the current hand (base class of Dealer and Player).
+    """
+
+    __slots__ = ('current_hand', 'num_cards', '_total', '_aces')
+
+    def __init__(self):
+        self.current_hand = np.empty(MAX_HAND, dtype=np.uint8)
+        self.num_cards = 0
+        self._total = 0
+        self._aces = 0
+
+    def add_card(self, card):
+        """
+        Adds a card to the current hand.
+
+        Parameters
+        ----------
+        card : int
+            The card (see Dealer.deal_card).
+        """
+        self.current_hand[self.num_cards] = card
+        self.num_cards += 1
+        # Keep a running total so the hand doesn't have to be recounted for every decision
+        rank = card & RANK_MASK
+        self._total += _VALUE[rank]
+        if rank == ACE:
+            self._aces += 1
+
+    def reset_hand(self):
+        """
+        Resets the current hand.
+        """
+        self.num_cards = 0
+        self._total = 0
+        self._aces = 0
+
+    def check_hand_total(self):
+        """
+        Checks the value of the current hand.
+
+        Return
+        ------
+        int, the value of the current hand.
+        """
+        return _best_total(self._total, self._aces)
+
+    def check_blackjack(self):
+        """
+        Checks whether the current hand has blackjack.
+
+        Return
+        ------
+        bool, whether or not the hand is blackjack.
+        """
+        return self.num_cards == 2 and check_blackjack(int(self.current_hand[0]) & RANK_MASK, int(self.current_hand[1]) & RANK_MASK)
+
+class Dealer(_Hand):
     """
     Creates a Dealer obj.
 
@@ -61,13 +510,15 @@ class Dealer(object):
     max_bet : int
         The maxiumum bet allowed at the table. Default 1000.
     """
+
+    __slots__ = ('hit_on_soft17', 'min_bet', 'max_bet', 'deck')
     
     def __init__(self, num_decks = 6, cut_card_loc = 1, hit_on_soft17 = True, min_bet = 15, max_bet = 1000):
         self.hit_on_soft17 = hit_on_soft17
         self.min_bet = min_bet
         self.max_bet = max_bet
+        super().__init__()
         self.deck = Deck(num_decks, cut_card_loc)
-        self.current_hand = []
 
 
     def decide_next_move(self):
@@ -78,81 +529,24 @@ class Dealer(object):
         ------
         str, a string indicating what to do next.
         """
-        # Check the different conditions
-        if self.check_hand_total(self.current_hand) < 17:
-            return 'hit'
-        else:
-            return 'stand'
+        return MOVES[_decide_dealer(self._total, self._aces, self.hit_on_soft17)]
 
     def deal_card(self):
         """
         Deals the first card in the current deck (deck treated like a stack so the "top card" is the last value in the array).
 
-        Returns the value of the card as tuple, first element is the value, second element in the suit.
+        Returns the card as a uint8, the rank code is card & RANK_MASK and the suit is card >> SUIT_SHIFT.
         """
-        return self.deck.current_deck.pop()
+        deck = self.deck
+        # Reshuffle if every card has been dealt (a round can run past the cut card), like _draw does
+        if deck._top < 0:
+            deck.shuffle()
+        card = deck.current_deck[deck._top]
+        deck._top -= 1
+        return card
 
-    def reset_hand(self):
-        """
-        Resets the current hand.
-        """
-        self.current_hand = []
 
-    def pay_out(self, player, winnings):
-        """
-        Pays a player for a round win.
-
-        Parameters
-        ----------
-        player : Player
-            The player object associated with the player who won.
-        winnings: float
-            The amount of money won by the player.
-        """
-        player.bank += winnings
-
-    @staticmethod
-    def check_blackjack(hand):
-        """
-        Checks whether a hand has blackjack.
-
-        Return
-        ------
-        bool, whether or not the hand is blackjack.
-        """
-        if (hand[0][0] == 'A' and hand[1][0] in ['10', 'J', 'Q', 'K']) or (hand[1][0] == 'A' and hand[0][0] in ['10', 'J', 'Q', 'K']):
-            return True
-        else:
-            return False
-
-    @staticmethod
-    def check_hand_total(hand):
-        """
-        Checks the value of a hand.
-
-        Return
-        ------
-        int, the value of the current hand.
-        """
-        hand_vals = [int(card[0]) if card[0] not in ['A', 'J', 'Q', 'K'] else 10 if card[0] in ['J', 'Q', 'K'] else 1 for card in hand]
-
-        # Check if any vals are aces
-        aces = [val for val in hand_vals if val == 1]
-        hand_sum = sum(hand_vals)
-        
-        if aces:
-            sum_with_eleven_ace = hand_sum + 10
-            
-            if sum_with_eleven_ace <= 21:
-                return sum_with_eleven_ace
-            else:
-                return hand_sum
-        
-        else:
-            return hand_sum
-
-
-class Player(object):
+class Player(_Hand):
     """
     Player class to keep track of player bank, strategy, and behavior.
 
@@ -167,30 +561,41 @@ class Player(object):
         The type of playing strategy used by the player. Currently only "basic" is supported,
         but will be adding "emotional" or something similar to simulate erratic player behavior.
     """
+    __slots__ = ('bank', 'bet_strategy', 'play_strategy', '_moves', 'move_table', 'current_bet', 'previous_bet',
+                 'previous_outcome')
+
     move_dict = {'H': 'hit', 'S': 'stand', 'D': 'double', 'SP': 'split'}
 
     def __init__(self, bank, bet_strategy = 'dalembert', play_strategy = 'basic'):
+        super().__init__()
         self.bank = bank
         self.bet_strategy = bet_strategy
-        # Replace play_strategy with df of strat
         self.play_strategy = play_strategy
-        self.current_hand = []
+        self._moves = None
+        self.move_table = None
         self.current_bet = 0
         self.previous_bet = None
         self.previous_outcome = None
 
     def choose_play_strategy(self, dealer):
         """
-        Filters the move df based on how many decks are being used.
+        Chooses the move table based on how many decks are being used.
+
+        Sets move_table, the strategy table of move codes (int8 array indexed by [hand_state(hand), dealer card rank
+        code]) to pass to play_round or simulate_many.
+
+        Parameters
+        ----------
+        dealer: Dealer
+            A dealer object so we can check how many decks are being used.
         """
-        df = pd.read_csv('./basic_strats.csv', index_col=0)
         if self.play_strategy == 'basic':
             if dealer.deck.num_decks == 1:
-                self.play_strategy = df[df['num_decks'] == 1]
+                self._moves, self.move_table = _STRAT_TABLES[1]
             elif dealer.deck.num_decks in [2,3]:
-                self.play_strategy = df[df['num_decks'] == 2]
+                self._moves, self.move_table = _STRAT_TABLES[2]
             else:
-                self.play_strategy = df[df['num_decks'] == 4]
+                self._moves, self.move_table = _STRAT_TABLES[4]
 
     def decide_next_move(self, dealer):
         """
@@ -205,24 +610,9 @@ class Player(object):
         ------
         str, a string indicating what to do next.
         """
-        dealer_card = dealer.current_hand[0][0]
-
-        # Check if player has blackjack
-        if len(self.current_hand) == 2 and Dealer.check_blackjack(self.current_hand):
-            return 'stand'
-        else:
-            if len(self.current_hand) == 2:
-                if self.current_hand[0][0] == self.current_hand[1][0]:
-                    return Player.move_dict[self.play_strategy.loc[f"{self.current_hand[0][0]},{self.current_hand[1][0]}", dealer_card]]
-                elif self.current_hand[0][0] == 'A' or self.current_hand[1][0] == 'A':
-                    if self.current_hand[0][0] == 'A':
-                        return Player.move_dict[self.play_strategy.loc[f"A{self.current_hand[1][0]}", dealer_card]]
-                    else:
-                        return Player.move_dict[self.play_strategy.loc[f"A{self.current_hand[0][0]}", dealer_card]]
-                else:
-                    return Player.move_dict[self.play_strategy.loc[f"{Dealer.check_hand_total(self.current_hand)}", dealer_card]]
-            else:
-                return Player.move_dict[self.play_strategy.loc[f"{Dealer.check_hand_total(self.current_hand)}", dealer_card]]
+        dealer_up = dealer.current_hand[0] & RANK_MASK
+        state = _hand_state(self.current_hand, self.num_cards, self._total, self._aces)
+        return self._moves[state][dealer_up]
 
     def check_bet_allowed(self, bet_amt, dealer):
         """
@@ -260,32 +650,48 @@ class Player(object):
         ------
         bool, whether or not the bet goes through.
         """
-        if not self.previous_bet and not self.previous_outcome:
-            self.current_bet = dealer.min_bet
-            self.bank -= self.current_bet
-        elif self.previous_outcome == 'win':
-            if self.previous_bet == dealer.min_bet:
-                if check_bet_allowed(dealer.min_bet, dealer):
-                    self.current_bet = dealer.min_bet
-                    self.bank -= self.current_bet
-                else:
-                    raise ValueError('Not enough funds for bet!')
-            else:
-                if check_bet_allowed(self.previous_bet-dealer.min_bet, dealer):
-                    self.current_bet = self.previous_bet-dealer.min_bet
-                    self.bank -= self.current_bet
-                else:
-                    raise ValueError('Not enough funds for bet!')
-        elif self.previous_outcome == 'loss':
-            if self.previous_bet == dealer.min_bet:
-                if check_bet_allowed(self.previous_bet+dealer.min_bet, dealer):
-                    self.current_bet = self.previous_bet+dealer.min_bet
-                    self.bank -= self.current_bet
-                elif self.previous_bet+dealer.min_bet > self.bank:
-                    raise ValueError('Not enough funds for bet!')
-                elif self.previous_bet+dealer.min_bet > dealer.max_bet:
-                    if check_bet_allowed(dealer.max_bet, dealer):
-                        self.current_bet = dealer.max_bet
-                        self.bank -= self.current_bet
-                    else:
-                        raise ValueError('Not enough funds for bet!')
\ No newline at end of file
+        # D'Alembert: go up a unit after a loss and down a unit after a win, staying within the table limits
+        bet = (self.previous_bet or dealer.min_bet) + _DALEMBERT_DELTA[self.previous_outcome]*dealer.min_bet
+        bet = min(max(bet, dealer.min_bet), dealer.max_bet)
+        if not self.check_bet_allowed(bet, dealer):
+            raise ValueError('Not enough funds for bet!')
+        self.current_bet = bet
+        self.bank -= bet
+        return True
+
+
+def _load_strategies(path):
+    """
+    Loads the basic strategies from a csv (basic_strats.csv).
+
+    Parameters
+    ----------
+    path : str
+        The path to the strategy csv.
+
+    Return
+    ------
+    dict, maps the number of decks to a tuple of the strategy as nested tuples of moves (for Player) and as an
+    int8 array of move codes (for the numba functions), both indexed by [hand_state(hand)][dealer card rank code].
+    """
+    # Group the rows (by hand label) for each number of decks
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = [header.index(label) for label in RANK_LABELS]
+        num_decks_column = header.index('num_decks')
+        rows = {}
+        for row in reader:
+            rows.setdefault(int(row[num_decks_column]), {})[row[0]] = row
+
+    strats = {}
+    for num_decks, strat_rows in rows.items():
+        # Blackjack isn't in the csv, the player always stands
+        strat_rows['A10'] = ['S']*len(header)
+        moves = tuple(tuple(Player.move_dict[strat_rows[label][column]] for column in columns) for label in _STATE_LABELS)
+        move_codes = np.array([[MOVES.index(move) for move in row] for row in moves], dtype=np.int8)
+        strats[num_decks] = (moves, move_codes)
+    return strats
+
+# Read the strategies once when the module is imported
+_STRAT_TABLES = _load_strategies(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'basic_strats.csv'))